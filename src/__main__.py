@@ -6,19 +6,15 @@ Main entry point for Copilot Citations CLI tool.
 import argparse
 import os
 import sys
+from typing import List, Optional
 
 # Adjust import path when running the script directly
 if __name__ == "__main__":
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from citation_extractor import CitationExtractor
-    from citation_generator import CitationGenerator
-else:
-    from src.citation_extractor import CitationExtractor
-    from src.citation_generator import CitationGenerator
 
 
-def main() -> int:
-    """Main entry point for the application."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="Extract and generate documentation for Copilot citations in code."
     )
@@ -61,13 +57,66 @@ def main() -> int:
         help="File extensions to scan (default: .py .js .ts .java .cs .cpp .c)",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-i",
+        "--ignore",
+        dest="ignore",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Directory/file names or glob patterns to exclude from the "
+        "scan, in addition to the built-in skip list",
+    )
+
+    parser.add_argument(
+        "--count-only",
+        dest="count_only",
+        action="store_true",
+        help="Only print the number of [CITATION] markers found, "
+        "without generating documentation",
+    )
+
+    return parser
+
+
+# Built once at import: add_argument allocates a pile of Action objects, so
+# repeated main() calls (the test suite, embedding callers) reuse one parser.
+_PARSER = _build_parser()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the application.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv[1:]. Passing
+            them explicitly lets tests and embedding callers invoke the
+            CLI in-process without touching sys.argv.
+    """
+    args = _PARSER.parse_args(argv)
 
     # Ensure input directory exists
     if not os.path.isdir(args.directory):
         print(f"Error: Directory not found: {args.directory}")
         return 1
 
+    # Import lazily so --help, argument errors, and the directory check
+    # above don't pay for module import and regex compilation on cold start.
+    try:
+        from src.citation_extractor import CitationExtractor
+        from src.citation_generator import CitationGenerator
+    except ImportError:
+        from citation_extractor import CitationExtractor
+        from citation_generator import CitationGenerator
+
+    if args.count_only:
+        # Counting markers never parses or generates anything, so it skips
+        # output-directory creation and the generator entirely.
+        count = CitationExtractor().count_markers(
+            args.directory, args.extensions, args.ignore
+        )
+        print(f"Found {count} citation markers.")
+        return 0
+
     # Ensure output directory exists
     output_dir = os.path.dirname(args.output)
     if output_dir and not os.path.exists(output_dir):
@@ -76,7 +125,9 @@ def main() -> int:
     try:
         # Extract citations
         extractor = CitationExtractor()
-        citations = extractor.extract_from_directory(args.directory, args.extensions)
+        citations = extractor.extract_from_directory(
+            args.directory, args.extensions, args.ignore
+        )
 
         if not citations:
             print("No citations found in the specified directory.")
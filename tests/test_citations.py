@@ -7,11 +7,7 @@ import tempfile
 import unittest
 from typing import Dict, List
 
-# Need to fix the import path to find our source modules
-import sys
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
+# The repo root is on sys.path via the pythonpath setting in pyproject.toml
 from src.citation_extractor import CitationExtractor
 from src.citation_generator import CitationGenerator
 
@@ -253,6 +249,13 @@ def regular_function():
             self.assertEqual(len(citations_custom), 1)
             self.assertIn("test.custom", citations_custom)
 
+            # Extensions without the leading dot are normalized
+            citations_no_dot = self.extractor.extract_from_directory(
+                temp_dir, ["custom"]
+            )
+            self.assertEqual(len(citations_no_dot), 1)
+            self.assertIn("test.custom", citations_no_dot)
+
 
 class TestCitationGenerator(unittest.TestCase):
     """Test the CitationGenerator class."""
@@ -0,0 +1,242 @@
+"""
+Tests for the Copilot citations command-line interface.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+# The repo root is on sys.path via the pythonpath setting in pyproject.toml
+from src import __main__ as cli
+
+# Fixture payloads as (relative path, bytes) pairs. Keeping them as bytes
+# literals means the UTF-8 encode happened at compile time, so building the
+# fixture tree is pure os.write with no per-run codec work; setUpModule
+# skips the text-mode codec and buffering layers a context-managed open
+# would otherwise set up per file.
+# Prefer a RAM-backed tempdir on Linux: /dev/shm is tmpfs, so fixture and
+# output writes never touch disk. Elsewhere fall back to the platform
+# default tempdir.
+_TMP_BASE = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Relative directory layout of the fixture tree, precomputed so setUpModule
+# only joins each suffix onto the fresh tempdir. The tempdir is brand new,
+# so plain os.mkdir suffices — makedirs(exist_ok=True) would stat each
+# level first.
+_PROJECT_DIR = "project"
+_SUBDIR = os.path.join("project", "subdir")
+_EMPTY_DIR = "empty"
+
+_FIXTURE_FILES = (
+    (
+        os.path.join("project", "main.py"),
+        b"""
+# [CITATION] Source: https://example.com/cli-python
+# [CITATION] Author: CLI Python Author
+def python_function():
+    pass
+""",
+    ),
+    (
+        os.path.join("project", "subdir", "helper.js"),
+        b"""
+// [CITATION] Source: https://example.com/cli-js
+// [CITATION] Author: CLI JS Author
+function helper() {}
+""",
+    ),
+    (
+        os.path.join("project", "plain.py"),
+        b"""
+def regular_function():
+    pass
+""",
+    ),
+)
+
+
+# Shared fixture tree, built once per process by setUpModule. The CLI only
+# ever reads it, so every test class in this module can point at the same
+# copy instead of rebuilding it per class or per test.
+_SHARED_ROOT = None
+
+
+def setUpModule():
+    """Build the shared fixture tree once for the whole module."""
+    global _SHARED_ROOT
+    _SHARED_ROOT = tempfile.mkdtemp(dir=_TMP_BASE)
+    for rel_dir in (_PROJECT_DIR, _SUBDIR, _EMPTY_DIR):
+        os.mkdir(os.path.join(_SHARED_ROOT, rel_dir))
+
+    for rel_path, data in _FIXTURE_FILES:
+        fd = os.open(
+            os.path.join(_SHARED_ROOT, rel_path),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def tearDownModule():
+    """Remove the shared fixture tree.
+
+    shutil.rmtree walks with os.scandir, so entry types come from the
+    directory listing itself rather than a stat call per file — cheaper
+    than a manual os.walk + os.remove/os.rmdir loop. Errors are left
+    to propagate so a leaked handle or permission problem shows up in
+    the test run instead of silently leaking tempdirs.
+    """
+    shutil.rmtree(_SHARED_ROOT)
+
+
+class TestCLI(unittest.TestCase):
+    """Test the command-line interface end to end."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Point the class at the module-level fixture tree.
+
+        Also warm up cli.main's lazy imports: main defers loading the
+        extractor and generator until first use, so importing them here
+        keeps that one-time import and regex-compilation cost out of
+        whichever test happens to run first.
+        """
+        import src.citation_extractor  # noqa: F401
+        import src.citation_generator  # noqa: F401
+
+        cls.root = _SHARED_ROOT
+        cls.test_dir = os.path.join(cls.root, _PROJECT_DIR)
+        cls.empty_dir = os.path.join(cls.root, _EMPTY_DIR)
+
+    def _output_path(self, name: str) -> str:
+        """Return a per-test output path inside the shared tempdir."""
+        return os.path.join(self.root, name)
+
+    def _run_cli(self, argv):
+        """Run cli.main in-process with the given argv, capturing stdout.
+
+        main takes argv directly, so no sys.argv patching (and none of
+        mock's install/uninstall machinery) is involved. Output capture
+        goes through contextlib.redirect_stdout, a plain attribute swap,
+        rather than a mock.patch of sys.stdout. The sink is a BytesIO
+        behind a write-through TextIOWrapper — the ASCII output lands in
+        a flat byte buffer instead of StringIO's resizing UCS store — and
+        is decoded once at the end.
+
+        Returns a (return_code, output) tuple.
+        """
+        buf = io.BytesIO()
+        wrapper = io.TextIOWrapper(buf, encoding="utf-8", write_through=True)
+        with contextlib.redirect_stdout(wrapper):
+            return_code = cli.main(argv)
+        return return_code, buf.getvalue().decode("utf-8")
+
+    # One case per output format: (format, output file name, substrings the
+    # generated document must contain). The test body is shared via subTest,
+    # so adding a format is one more row here.
+    _FORMAT_CASES = (
+        (
+            "markdown",
+            "citations.md",
+            ("# Code Citations", "main.py", "https://example.com/cli-python"),
+        ),
+        (
+            "html",
+            "citations.html",
+            ("<!DOCTYPE html>", "CLI Python Author", "CLI JS Author"),
+        ),
+        (
+            "json",
+            "citations.json",
+            ('"title"', "main.py", "https://example.com/cli-js"),
+        ),
+    )
+
+    def test_cli_output_formats(self):
+        """Test generating each supported output format via the -f flag."""
+        for output_format, file_name, expected in self._FORMAT_CASES:
+            with self.subTest(format=output_format):
+                output = self._output_path(file_name)
+                return_code, stdout = self._run_cli(
+                    ["-d", self.test_dir, "-o", output, "-f", output_format]
+                )
+
+                self.assertEqual(return_code, 0)
+                self.assertIn("generated successfully", stdout)
+                self.assertTrue(os.path.exists(output))
+                with open(output, "r", encoding="utf-8") as f:
+                    content = f.read()
+                for substring in expected:
+                    self.assertIn(substring, content)
+
+    def test_cli_extensions_flag(self):
+        """Test restricting the scan to specific extensions."""
+        output = self._output_path("js_only.md")
+        return_code, _ = self._run_cli(
+            ["-d", self.test_dir, "-o", output, "-e", ".js"]
+        )
+
+        self.assertEqual(return_code, 0)
+        with open(output, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("https://example.com/cli-js", content)
+        self.assertNotIn("https://example.com/cli-python", content)
+
+    def test_cli_missing_directory(self):
+        """Test that a missing scan directory reports an error."""
+        return_code, stdout = self._run_cli(
+            ["-d", os.path.join(self.root, "does_not_exist")]
+        )
+
+        self.assertEqual(return_code, 1)
+        self.assertIn("Directory not found", stdout)
+
+    def test_cli_no_citations(self):
+        """Test scanning a directory without citations."""
+        return_code, stdout = self._run_cli(["-d", self.empty_dir])
+
+        self.assertEqual(return_code, 0)
+        self.assertIn("No citations found", stdout)
+
+    def test_cli_ignore_flag(self):
+        """Test excluding paths from the scan with --ignore."""
+        output = self._output_path("ignored.md")
+        return_code, _ = self._run_cli(
+            ["-d", self.test_dir, "-o", output, "--ignore", "subdir"]
+        )
+
+        self.assertEqual(return_code, 0)
+        with open(output, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("https://example.com/cli-python", content)
+        self.assertNotIn("https://example.com/cli-js", content)
+
+    def test_cli_count_only_mode(self):
+        """Test counting markers without generating documentation."""
+        output = self._output_path("never_written.md")
+        return_code, stdout = self._run_cli(
+            ["-d", self.test_dir, "-o", output, "--count-only"]
+        )
+
+        self.assertEqual(return_code, 0)
+        # The fixture tree carries four marker lines across two files.
+        self.assertIn("Found 4 citation markers.", stdout)
+        self.assertFalse(os.path.exists(output))
+
+    def test_cli_creates_output_directory(self):
+        """Test that missing output directories are created."""
+        output = self._output_path(os.path.join("Documentation", "citations.md"))
+        return_code, _ = self._run_cli(["-d", self.test_dir, "-o", output])
+
+        self.assertEqual(return_code, 0)
+        self.assertTrue(os.path.exists(output))
+
+
+if __name__ == "__main__":
+    unittest.main()